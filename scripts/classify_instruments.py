@@ -6,6 +6,7 @@ and then predicts instrument presence using the MTG-Jamendo instrument detector.
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 from tqdm import tqdm
@@ -19,6 +20,9 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 RESULTS_DIR = os.path.join(BASE_DIR, "results")
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+from utils.resources import configure_tensorflow
+
 # --------------------------
 # MODEL PATHS
 # --------------------------
@@ -30,6 +34,9 @@ INSTRUMENT_MODEL_PATH = os.path.join(BASE_DIR, "models", "mtg_jamendo_instrument
 # --------------------------
 # LOAD MODELS
 # --------------------------
+# Size TensorFlow's thread pools from the saved resource configuration
+configure_tensorflow()
+
 embedding_model = TensorflowPredictEffnetDiscogs(
     graphFilename=EMBEDDING_MODEL_PATH,
     output="PartitionedCall:1"
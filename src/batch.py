@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batch runner for the Music Feature Extraction application.
+Runs the mood/theme and instrument classifiers over a directory of audio files,
+isolating each file in a watchdog-supervised worker process.
+"""
+
+import os
+import argparse
+
+from classifiers.mood_theme_classifier import MoodThemeClassifier
+from classifiers.instrument_detector import InstrumentDetector
+from utils.config import (BATCH_TIMEOUT, MAX_TASKS_PER_WORKER, MOOD_THEME_CSV, INSTRUMENT_CSV,
+                          MOOD_THEME_ERROR_LOG, INSTRUMENT_ERROR_LOG)
+from utils.paths import get_project_root, get_models_path, ensure_dir_exists
+
+
+def parse_args():
+    """
+    Parse command-line arguments for the batch runner.
+    """
+    root = get_project_root()
+    parser = argparse.ArgumentParser(description="Batch-classify a directory of audio files.")
+    parser.add_argument("--data-dir", default=os.path.join(root, "data"),
+                        help="Directory containing MP3 files")
+    parser.add_argument("--results-dir", default=os.path.join(root, "results"),
+                        help="Directory to write CSV results and error logs to")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (defaults to the tuned configuration)")
+    parser.add_argument("--timeout", type=float, default=BATCH_TIMEOUT,
+                        help="Per-file timeout in seconds (0 disables the timeout)")
+    parser.add_argument("--max-tasks-per-worker", type=int, default=MAX_TASKS_PER_WORKER,
+                        help="Recycle a worker after this many files")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Only re-run the files recorded in the previous error logs")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    models_path = get_models_path()
+    results_dir = ensure_dir_exists(args.results_dir)
+
+    tasks = [
+        (MoodThemeClassifier, MOOD_THEME_CSV, MOOD_THEME_ERROR_LOG),
+        (InstrumentDetector, INSTRUMENT_CSV, INSTRUMENT_ERROR_LOG),
+    ]
+    for classifier_cls, csv_name, error_log_name in tasks:
+        classifier_cls.process_audio_files(
+            models_path,
+            args.data_dir,
+            os.path.join(results_dir, csv_name),
+            workers=args.workers,
+            timeout=args.timeout or None,
+            max_tasks_per_worker=args.max_tasks_per_worker,
+            error_log=os.path.join(results_dir, error_log_name),
+            retry_failed=args.retry_failed
+        )
+
+
+if __name__ == "__main__":
+    main()
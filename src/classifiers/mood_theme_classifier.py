@@ -8,9 +8,12 @@ MTG-Jamendo models. It provides detailed emotional and thematic tags for music t
 import os
 import pandas as pd
 import numpy as np
-from tqdm import tqdm
 from essentia.standard import MonoLoader, TensorflowPredictEffnetDiscogs, TensorflowPredict2D
 
+from utils.config import BATCH_TIMEOUT, MAX_TASKS_PER_WORKER, MOOD_THEME_ERROR_LOG
+from utils.resources import configure_tensorflow
+from utils.watchdog import run_batch, read_error_log, write_error_log
+
 
 class MoodThemeClassifier:
     """Class for classifying mood and theme in audio tracks."""
@@ -26,27 +29,37 @@ class MoodThemeClassifier:
         "travel", "upbeat", "uplifting"
     ]
     
-    def __init__(self, models_dir):
+    def __init__(self, models_dir, embedding_model=None):
         """
         Initialize the mood/theme classifier with model paths.
         
         Args:
             models_dir (str): Path to the directory containing models.
+            embedding_model: Already loaded Discogs EfficientNet model to share
+                with another classifier instead of loading a second copy.
         """
         # Model paths
         embedding_model_path = os.path.join(models_dir, "discogs-effnet-bs64-1.pb")
         mood_theme_model_path = os.path.join(models_dir, "mtg_jamendo_moodtheme-discogs-effnet-1.pb")
         
-        # Load embedding model
-        self.embedding_model = TensorflowPredictEffnetDiscogs(
-            graphFilename=embedding_model_path,
-            output="PartitionedCall:1"
-        )
+        # Size TensorFlow's thread pools before the sessions are created
+        configure_tensorflow()
+
+        # Load embedding model, unless one is shared with us
+        if embedding_model is None:
+            embedding_model = TensorflowPredictEffnetDiscogs(
+                graphFilename=embedding_model_path,
+                output="PartitionedCall:1"
+            )
+        self.embedding_model = embedding_model
         
         # Load mood/theme model
         self.mood_theme_model = TensorflowPredict2D(
             graphFilename=mood_theme_model_path
         )
+
+        # Stage and message of the most recent failure, read by the batch runner
+        self.last_error = None
     
     def predict_mood_theme(self, file_path):
         """
@@ -58,11 +71,13 @@ class MoodThemeClassifier:
         Returns:
             dict: Dictionary with probabilities for each mood/theme label.
         """
+        self.last_error = None
         try:
             # Load audio at 16 kHz with resampleQuality=4
             audio = MonoLoader(filename=file_path, sampleRate=16000, resampleQuality=4)()
         except Exception as e:
             print(f"Failed to load {file_path}: {e}")
+            self.last_error = {"stage": "load", "error": str(e)}
             return None
 
         try:
@@ -70,55 +85,96 @@ class MoodThemeClassifier:
             embeddings = self.embedding_model(audio)
         except Exception as e:
             print(f"Error computing embeddings for {file_path}: {e}")
+            self.last_error = {"stage": "embedding", "error": str(e)}
             return None
 
         try:
-            # Predict mood and theme probabilities
-            predictions = self.mood_theme_model(embeddings)
+            # Predict mood and theme probabilities and map them to labels
+            predictions = self.predict_from_embeddings(embeddings)
         except Exception as e:
             print(f"Error computing predictions for {file_path}: {e}")
+            self.last_error = {"stage": "prediction", "error": str(e)}
             return None
 
-        # Process predictions
-        result = {"filename": os.path.basename(file_path)}
-        try:
-            if isinstance(predictions, np.ndarray):
-                # Flatten predictions in case of multi-dimensional output
-                predictions = predictions.flatten()
-                for i, label in enumerate(self.LABELS):
-                    # Map each probability to the corresponding label
-                    result[label] = float(predictions[i]) if i < len(predictions) else None
-            else:
-                result["predictions"] = predictions
-        except Exception as e:
-            print(f"Error processing predictions for {file_path}: {e}")
-            return None
-
-        return result
+        return {"filename": os.path.basename(file_path), **predictions}
     
-    def process_audio_files(self, data_dir, results_csv):
+    def predict_from_embeddings(self, embeddings):
+        """
+        Predict mood/theme probabilities from precomputed Discogs EfficientNet embeddings.
+
+        Lets callers that run several classifiers compute the embeddings once.
+
+        Args:
+            embeddings (np.ndarray): Output of the embedding model.
+
+        Returns:
+            dict: Dictionary with probabilities for each mood/theme label.
+        """
+        predictions = self.mood_theme_model(embeddings)
+        if not isinstance(predictions, np.ndarray):
+            return {"predictions": predictions}
+
+        # Flatten predictions in case of multi-dimensional output
+        predictions = predictions.flatten()
+        return {label: float(predictions[i]) if i < len(predictions) else None
+                for i, label in enumerate(self.LABELS)}
+
+    @classmethod
+    def process_audio_files(cls, models_dir, data_dir, results_csv, workers=None,
+                            timeout=BATCH_TIMEOUT, max_tasks_per_worker=MAX_TASKS_PER_WORKER,
+                            error_log=None, retry_failed=False):
         """
         Process all MP3 files in a directory and save mood/theme predictions to CSV.
-        
+
+        Each file runs in a worker process under a watchdog, so a corrupt or
+        hanging file is logged and skipped instead of stalling the batch. The
+        models are only loaded inside the workers.
+
         Args:
+            models_dir (str): Path to the directory containing models.
             data_dir (str): Directory containing MP3 files.
             results_csv (str): Path to save the CSV results.
+            workers (int): Number of worker processes. Defaults to the saved
+                resource configuration.
+            timeout (float): Per-file timeout in seconds, or None to disable.
+            max_tasks_per_worker (int): Recycle a worker after this many files.
+            error_log (str): Path of the JSON-lines error log. Defaults to
+                MOOD_THEME_ERROR_LOG next to results_csv.
+            retry_failed (bool): Only re-run the files listed in error_log and
+                merge their predictions into the existing results_csv.
         """
-        audio_files = [f for f in os.listdir(data_dir) if f.lower().endswith(".mp3")]
-        if not audio_files:
-            print(f"No MP3 files found in {data_dir}")
-            return
-
-        all_results = []
-        for file_name in tqdm(audio_files, desc="Predicting Mood/Theme"):
-            file_path = os.path.join(data_dir, file_name)
-            prediction = self.predict_mood_theme(file_path)
-            if prediction is not None:
-                all_results.append(prediction)
+        if error_log is None:
+            error_log = os.path.join(os.path.dirname(results_csv), MOOD_THEME_ERROR_LOG)
+
+        if retry_failed:
+            file_paths = read_error_log(error_log)
+            if not file_paths:
+                print(f"No failed files recorded in {error_log}")
+                return
+        else:
+            audio_files = [f for f in os.listdir(data_dir) if f.lower().endswith(".mp3")]
+            if not audio_files:
+                print(f"No MP3 files found in {data_dir}")
+                return
+            file_paths = [os.path.join(data_dir, f) for f in audio_files]
+
+        all_results, failures = run_batch(
+            file_paths, cls, (models_dir,), "predict_mood_theme",
+            workers=workers, timeout=timeout,
+            max_tasks_per_worker=max_tasks_per_worker, desc="Predicting Mood/Theme"
+        )
+
+        write_error_log(error_log, failures)
+        if failures:
+            print(f"{len(failures)} files failed. Details written to {error_log}")
 
         if all_results:
             df = pd.DataFrame(all_results)
+            if retry_failed and os.path.exists(results_csv):
+                previous = pd.read_csv(results_csv)
+                previous = previous[~previous["filename"].isin(df["filename"])]
+                df = pd.concat([previous, df], ignore_index=True)
             df.to_csv(results_csv, index=False)
             print(f"Processed {len(all_results)} files. Results saved to {results_csv}")
         else:
-            print("No predictions computed.") 
\ No newline at end of file
+            print("No predictions computed.")
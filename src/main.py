@@ -8,26 +8,86 @@ This file serves as a bridge between the web interface and the backend classifie
 
 import os
 import sys
+import threading
 from pathlib import Path
 
+from essentia.standard import MonoLoader
+
 # Import classifiers
 from classifiers.mood_theme_classifier import MoodThemeClassifier
 from classifiers.instrument_detector import InstrumentDetector
+from utils.config import SAMPLE_RATE_LOW
 from utils.paths import get_models_path
 
+# Classifiers are loaded once per process and reused across requests. The
+# server handles requests on several threads and essentia algorithms are not
+# thread-safe, so loading and inference are each serialized by a lock.
+_classifiers = None
+_load_lock = threading.Lock()
+_inference_lock = threading.Lock()
+
 def load_classifiers():
     """
     Load the mood theme and instrument classifiers
+    
+    Both classifiers share a single Discogs EfficientNet embedding model.
+    """
+    global _classifiers
+    with _load_lock:
+        if _classifiers is None:
+            models_path = get_models_path()
+            mood_theme_classifier = MoodThemeClassifier(models_path)
+            instrument_detector = InstrumentDetector(
+                models_path, embedding_model=mood_theme_classifier.embedding_model
+            )
+            _classifiers = (mood_theme_classifier, instrument_detector)
+    return _classifiers
+
+def analyze_stages(audio_path):
     """
-    models_path = get_models_path()
+    Analyze an audio file, yielding an event as each stage completes
     
-    mood_theme_model = os.path.join(models_path, "mtg_jamendo_moodtheme-discogs-effnet-1.pb")
-    instrument_model = os.path.join(models_path, "mtg_jamendo_instrument-discogs-effnet-1.pb")
+    Audio is loaded and embedded once, then each classifier head runs on the
+    shared embeddings, so partial results are available before the whole
+    analysis finishes. The inference lock is held per stage rather than
+    across yields, so a slow client does not block other requests.
     
-    mood_theme_classifier = MoodThemeClassifier(model_path=mood_theme_model)
-    instrument_detector = InstrumentDetector(model_path=instrument_model)
+    Args:
+        audio_path: Path to the audio file
+        
+    Yields:
+        Dicts with an "event" key: "stage" after loading and embedding,
+        "head" with the results of each classifier head, "track" with the
+        combined results, or "error" with the failing stage ("init" if the
+        models could not be loaded)
+    """
+    track = os.path.basename(audio_path)
     
-    return mood_theme_classifier, instrument_detector
+    stage = "init"
+    try:
+        mood_theme_classifier, instrument_detector = load_classifiers()
+        
+        stage = "load"
+        audio = MonoLoader(filename=audio_path, sampleRate=SAMPLE_RATE_LOW, resampleQuality=4)()
+        yield {"event": "stage", "track": track, "stage": stage}
+        
+        stage = "embedding"
+        with _inference_lock:
+            embeddings = mood_theme_classifier.embedding_model(audio)
+        yield {"event": "stage", "track": track, "stage": stage}
+        
+        results = {}
+        for head, classifier in (("mood_themes", mood_theme_classifier),
+                                 ("instruments", instrument_detector)):
+            stage = head
+            with _inference_lock:
+                results[head] = classifier.predict_from_embeddings(embeddings)
+            yield {"event": "head", "track": track, "head": head, "results": results[head]}
+    except Exception as e:
+        yield {"event": "error", "track": track, "stage": stage, "error": str(e)}
+        return
+    
+    yield {"event": "track", "track": track, "results": results}
 
 def process_audio(audio_path):
     """
@@ -39,15 +99,11 @@ def process_audio(audio_path):
     Returns:
         Dict containing the extracted features
     """
-    mood_theme_classifier, instrument_detector = load_classifiers()
-    
-    mood_results = mood_theme_classifier.predict(audio_path)
-    instrument_results = instrument_detector.predict(audio_path)
-    
-    return {
-        "mood_themes": mood_results,
-        "instruments": instrument_results
-    }
+    for event in analyze_stages(audio_path):
+        if event["event"] == "error":
+            raise RuntimeError(f"{event['stage']} failed: {event['error']}")
+        if event["event"] == "track":
+            return event["results"]
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
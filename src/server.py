@@ -8,21 +8,36 @@ This file serves as a bridge between the web interface and the backend classifie
 
 import os
 import json
+import shutil
 import tempfile
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Request, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 
-from main import process_audio
+from main import process_audio, analyze_stages
 from utils.paths import get_web_dir
 
+# Limit single-file uploads to 16MB and multi-file stream requests to 256MB in total
+MAX_UPLOAD_SIZE = 16 * 1024 * 1024
+MAX_STREAM_UPLOAD_SIZE = 256 * 1024 * 1024
+
+class UploadRequest(Request):
+    """Request that raises the upload limit for the streaming endpoint only"""
+    
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'analyze_audio_stream':
+            return MAX_STREAM_UPLOAD_SIZE
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 CORS(app)  # Enable CORS for all routes
 
 # Temporary directory for uploaded files
 UPLOAD_FOLDER = tempfile.mkdtemp()
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # Limit uploads to 16MB
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_SIZE
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'mp3', 'wav', 'ogg', 'flac'}
@@ -62,6 +77,58 @@ def analyze_audio():
     
     return jsonify({'error': 'File type not allowed'}), 400
 
+def format_event(event, sse):
+    """Serialize an analysis event as an SSE message or an NDJSON line"""
+    data = json.dumps(event)
+    if sse:
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+@app.route('/api/analyze/stream', methods=['POST'])
+def analyze_audio_stream():
+    """
+    Analyze several uploaded files, streaming progress and partial results
+    
+    Emits newline-delimited JSON by default, or server-sent events when
+    called with ?format=sse. Events are sent as each stage and classifier
+    head completes for each track, then the next track starts immediately.
+    """
+    files = [f for f in request.files.getlist('audio') if f.filename != '']
+    if not files:
+        return jsonify({'error': 'No file provided'}), 400
+    
+    rejected = [f.filename for f in files if not allowed_file(f.filename)]
+    if rejected:
+        return jsonify({'error': 'File type not allowed', 'files': rejected}), 400
+    
+    # Save every upload before streaming, the request body is gone once the response starts
+    upload_dir = tempfile.mkdtemp(dir=app.config['UPLOAD_FOLDER'])
+    filepaths = []
+    for i, file in enumerate(files):
+        # One subdirectory per upload so files with the same name do not collide
+        filepath = os.path.join(upload_dir, str(i), secure_filename(file.filename))
+        os.makedirs(os.path.dirname(filepath))
+        file.save(filepath)
+        filepaths.append(filepath)
+    
+    sse = request.args.get('format') == 'sse'
+    
+    def generate():
+        try:
+            yield format_event({'event': 'start', 'tracks': [os.path.basename(p) for p in filepaths]}, sse)
+            for filepath in filepaths:
+                for event in analyze_stages(filepath):
+                    yield format_event(event, sse)
+                os.remove(filepath)
+            yield format_event({'event': 'done'}, sse)
+        finally:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+    
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+    # Ask reverse proxies not to buffer, so events reach the client as they happen
+    return Response(generate(), mimetype=mimetype, headers={'Cache-Control': 'no-cache',
+                                                              'X-Accel-Buffering': 'no'})
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_web(path):
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Auto-tuner for the Music Feature Extraction application.
+Benchmarks worker counts and TensorFlow thread pool sizes on this machine and
+saves the fastest configuration for the batch runner and the server.
+"""
+
+import os
+import sys
+import argparse
+
+from classifiers.instrument_detector import InstrumentDetector
+from utils.config import BATCH_TIMEOUT
+from utils.paths import get_project_root, get_models_path
+from utils.resources import autotune, save_resource_config
+
+
+def parse_args():
+    """
+    Parse command-line arguments for the auto-tuner.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark and save the best thread/core budget.")
+    parser.add_argument("--data-dir", default=os.path.join(get_project_root(), "data"),
+                        help="Directory containing sample MP3 files")
+    parser.add_argument("--samples", type=int, default=8,
+                        help="Number of files to benchmark with")
+    parser.add_argument("--files-per-worker", type=int, default=4,
+                        help="Files each worker processes per combination, after its models are loaded")
+    parser.add_argument("--max-workers", type=int, default=None,
+                        help="Largest worker count to try (defaults to the number of cores, "
+                             "capped at --samples)")
+    parser.add_argument("--timeout", type=float, default=BATCH_TIMEOUT,
+                        help="Per-file timeout in seconds")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    audio_files = sorted(f for f in os.listdir(args.data_dir) if f.lower().endswith(".mp3"))
+    if not audio_files:
+        print(f"No MP3 files found in {args.data_dir}")
+        return
+    file_paths = [os.path.join(args.data_dir, f) for f in audio_files[:args.samples]]
+
+    # Both classifiers share the Discogs EfficientNet backbone, which dominates
+    # the cost, so benchmarking one of them is representative
+    try:
+        best_config, measurements = autotune(
+            file_paths, InstrumentDetector, (get_models_path(),), "detect_instruments",
+            max_workers=args.max_workers, files_per_worker=args.files_per_worker,
+            timeout=args.timeout
+        )
+    except RuntimeError as e:
+        # Leave any previously saved configuration untouched
+        print(f"Auto-tuning failed: {e}")
+        sys.exit(1)
+
+    for config, throughput in measurements:
+        print(f"workers={config['workers']} intra={config['intra_op_threads']} "
+              f"inter={config['inter_op_threads']} pin={config['pin_cpus']}: "
+              f"{throughput:.2f} files/s")
+
+    path = save_resource_config(best_config)
+    print(f"Best configuration saved to {path}: {best_config}")
+
+
+if __name__ == "__main__":
+    main()
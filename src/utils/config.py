@@ -22,4 +22,16 @@ INSTRUMENT_CSV = 'instrument_predictions.csv'
 LOW_LEVEL_CSV = 'low_level_features.csv'
 
 # Output verbosity
-VERBOSE = True 
\ No newline at end of file
+VERBOSE = True 
+
+# Batch execution settings
+BATCH_TIMEOUT = 300           # Per-file timeout in seconds
+MAX_TASKS_PER_WORKER = 50     # Recycle workers after this many files to limit memory growth
+WORKER_INIT_TIMEOUT = 600     # Seconds a worker may take to load its models
+MAX_INIT_FAILURES = 3         # Give up on the batch after this many worker start failures in a row
+# Structured logs of failed files, one JSON object per line
+MOOD_THEME_ERROR_LOG = 'mood_theme_errors.jsonl'
+INSTRUMENT_ERROR_LOG = 'instrument_errors.jsonl'
+
+# Thread and core budget written by the auto-tuner, relative to the project root
+RESOURCE_CONFIG = 'resource_config.json'
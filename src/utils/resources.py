@@ -0,0 +1,236 @@
+"""
+CPU resource management for the music feature extraction package.
+Controls how many threads TensorFlow uses inside the essentia predictors and
+which cores each worker process runs on, so that several classifiers or
+workers sharing a machine do not oversubscribe it.
+"""
+
+import os
+import json
+
+from utils.config import RESOURCE_CONFIG
+from utils.paths import get_project_root
+
+
+def get_available_cpus():
+    """
+    Get the CPU cores this process is allowed to run on.
+
+    Returns:
+        list: Sorted list of core indices.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def default_resource_config(workers=1):
+    """
+    Build a resource configuration that splits the available cores evenly
+    across workers.
+
+    Args:
+        workers (int): Number of worker processes sharing the machine.
+
+    Returns:
+        dict: Resource configuration.
+    """
+    cpus = len(get_available_cpus())
+    return {
+        "workers": workers,
+        "intra_op_threads": max(1, cpus // workers),
+        "inter_op_threads": 1,
+        "pin_cpus": False
+    }
+
+
+def get_resource_config_path():
+    """
+    Get the absolute path to the saved resource configuration.
+
+    Returns:
+        str: Absolute path to the resource configuration file.
+    """
+    return os.path.join(get_project_root(), RESOURCE_CONFIG)
+
+
+def load_resource_config(path=None):
+    """
+    Load the resource configuration saved by the auto-tuner, falling back to
+    an even split of the available cores for a single worker.
+
+    Args:
+        path (str): Path to the configuration file. Defaults to RESOURCE_CONFIG
+            in the project root.
+
+    Returns:
+        dict: Resource configuration.
+    """
+    path = path or get_resource_config_path()
+    config = default_resource_config()
+    if os.path.exists(path):
+        with open(path) as f:
+            config.update(json.load(f))
+    return config
+
+
+def standalone_resource_config(path=None):
+    """
+    Build the resource configuration for a process that runs TensorFlow on
+    its own, such as the server or the scripts.
+
+    The saved intra-op size is each batch worker's share of the cores, so a
+    standalone process uses all available cores instead and keeps only the
+    tuned inter-op size.
+
+    Args:
+        path (str): Path to the configuration file. Defaults to RESOURCE_CONFIG
+            in the project root.
+
+    Returns:
+        dict: Resource configuration.
+    """
+    config = default_resource_config(1)
+    config["inter_op_threads"] = load_resource_config(path)["inter_op_threads"]
+    return config
+
+
+def save_resource_config(config, path=None):
+    """
+    Save a resource configuration for the batch runner and server to pick up.
+
+    Args:
+        config (dict): Resource configuration.
+        path (str): Path to the configuration file. Defaults to RESOURCE_CONFIG
+            in the project root.
+
+    Returns:
+        str: Path the configuration was written to.
+    """
+    path = path or get_resource_config_path()
+    with open(path, "w") as f:
+        json.dump(config, f, indent=2)
+    return path
+
+
+def configure_tensorflow(config=None):
+    """
+    Set TensorFlow thread pool sizes for this process.
+
+    Essentia creates its TensorFlow session when a predictor is constructed,
+    and TensorFlow reads these variables at that point, so this must run
+    before building TensorflowPredictEffnetDiscogs or TensorflowPredict2D.
+
+    Args:
+        config (dict): Resource configuration to apply. If omitted, the
+            standalone configuration is applied only when the process has not
+            already been configured, e.g. by configure_worker.
+    """
+    if config is None:
+        if "TF_NUM_INTRAOP_THREADS" in os.environ:
+            return
+        config = standalone_resource_config()
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(config["intra_op_threads"])
+    os.environ["TF_NUM_INTEROP_THREADS"] = str(config["inter_op_threads"])
+
+
+def configure_worker(worker_index, config):
+    """
+    Apply a resource configuration to a worker process: thread pool sizes and,
+    if enabled and supported, pinning to a dedicated slice of cores.
+
+    Args:
+        worker_index (int): Index of the worker slot, from 0 to workers - 1.
+        config (dict): Resource configuration.
+    """
+    configure_tensorflow(config)
+    if not config.get("pin_cpus") or not hasattr(os, "sched_setaffinity"):
+        return
+
+    cpus = get_available_cpus()
+    width = config["intra_op_threads"]
+    start = (worker_index * width) % len(cpus)
+    cores = [cpus[(start + i) % len(cpus)] for i in range(min(width, len(cpus)))]
+    os.sched_setaffinity(0, cores)
+
+
+def autotune(file_paths, factory, factory_args, method_name, max_workers=None,
+             files_per_worker=4, timeout=None):
+    """
+    Benchmark combinations of worker count and thread pool sizes on this
+    machine and return the one with the highest throughput.
+
+    Every combination starts fresh worker processes with their own TensorFlow
+    sessions, but the clock only starts once they have all loaded their
+    models, so the score reflects steady-state throughput.
+
+    Args:
+        file_paths (list): Sample audio files to benchmark with.
+        factory (callable): Picklable class that builds the classifier.
+        factory_args (tuple): Positional arguments passed to the factory.
+        method_name (str): Name of the per-file prediction method.
+        max_workers (int): Largest worker count to try. Defaults to the number
+            of available cores, and never exceeds the number of sample files.
+        files_per_worker (int): Files each worker processes per combination;
+            the samples are repeated as needed.
+        timeout (float): Per-file timeout in seconds for the benchmark runs.
+
+    Returns:
+        tuple: (best_config, measurements) where measurements is a list of
+            (config, files_per_second) pairs for the combinations that
+            completed at least one file.
+
+    Raises:
+        RuntimeError: If no combination completed any file, e.g. because the
+            models could not be loaded.
+    """
+    # Imported here to avoid a circular import, watchdog depends on this module
+    from utils.watchdog import run_batch
+
+    cpus = len(get_available_cpus())
+    max_workers = min(max_workers or cpus, len(file_paths))
+
+    candidates = []
+    workers = 1
+    while workers <= max_workers:
+        # Powers of two up to this worker's share of the cores, plus the share itself
+        share = max(1, cpus // workers)
+        intra_options = sorted({2 ** i for i in range(share.bit_length()) if 2 ** i <= share} | {share})
+        for intra in intra_options:
+            for inter in (1, 2):
+                for pin_cpus in (False, True):
+                    if pin_cpus and (workers == 1 or not hasattr(os, "sched_setaffinity")):
+                        continue
+                    candidates.append({
+                        "workers": workers,
+                        "intra_op_threads": intra,
+                        "inter_op_threads": inter,
+                        "pin_cpus": pin_cpus
+                    })
+        workers *= 2
+
+    measurements = []
+    last_error = None
+    for config in candidates:
+        count = config["workers"] * files_per_worker
+        batch = [file_paths[i % len(file_paths)] for i in range(count)]
+        stats = {}
+        results, failures = run_batch(
+            batch, factory, factory_args, method_name,
+            workers=config["workers"], timeout=timeout, resource_config=config,
+            desc=f"{config['workers']}w/{config['intra_op_threads']}i/{config['inter_op_threads']}o",
+            stats=stats
+        )
+        elapsed = stats["elapsed"]
+        if failures:
+            last_error = f"{failures[-1]['stage']}: {failures[-1]['error']}"
+        # Runs that processed nothing say nothing about throughput
+        if not results or not elapsed:
+            continue
+        measurements.append((config, len(results) / elapsed))
+
+    if not measurements:
+        raise RuntimeError(f"No benchmark run completed any file (last error: {last_error})")
+
+    best_config = max(measurements, key=lambda m: m[1])[0]
+    return best_config, measurements
@@ -0,0 +1,279 @@
+"""
+Fault-isolated batch execution for the music feature extraction package.
+Runs each audio file in a worker process under a per-file timeout, recycles
+workers after a hang or after a fixed number of tasks, and records failures
+to a structured error log so they can be retried later.
+"""
+
+import os
+import json
+import time
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+
+from tqdm import tqdm
+
+from utils.config import WORKER_INIT_TIMEOUT, MAX_INIT_FAILURES
+from utils.resources import configure_worker, default_resource_config, load_resource_config
+
+
+def _worker_main(conn, slot, resource_config, factory, factory_args, method_name):
+    """
+    Worker process loop: build the classifier once, then process files sent
+    over the pipe until a None sentinel is received.
+
+    Args:
+        conn: Child end of the pipe shared with the parent process.
+        slot (int): Index of the worker slot, used to pick its cores.
+        resource_config (dict): Thread and core budget for this worker.
+        factory (callable): Class (or function) that builds the classifier.
+        factory_args (tuple): Positional arguments passed to the factory.
+        method_name (str): Name of the per-file prediction method.
+    """
+    try:
+        configure_worker(slot, resource_config)
+        instance = factory(*factory_args)
+    except Exception as e:
+        conn.send(("init_failed", str(e)))
+        return
+    conn.send(("ready", None))
+
+    predict = getattr(instance, method_name)
+    while True:
+        file_path = conn.recv()
+        if file_path is None:
+            break
+        try:
+            prediction = predict(file_path)
+        except Exception as e:
+            conn.send((file_path, None, {"stage": "prediction", "error": str(e)}))
+            continue
+        error = None
+        if prediction is None:
+            error = getattr(instance, "last_error", None) or {"stage": "prediction", "error": "no prediction returned"}
+        conn.send((file_path, prediction, error))
+
+
+class _Worker:
+    """Handle on a single worker process and the task it is running."""
+
+    def __init__(self, ctx, slot, resource_config, factory, factory_args, method_name, init_timeout):
+        self.slot = slot
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, slot, resource_config, factory, factory_args, method_name),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        # The worker reports readiness over the pipe; until then the deadline
+        # bounds how long model loading may take
+        self.ready = False
+        self.deadline = time.monotonic() + init_timeout if init_timeout else None
+        self.tasks_done = 0
+        self.current = None
+
+    def submit(self, file_path, timeout):
+        self.current = file_path
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.conn.send(file_path)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def write_error_log(error_log, failures):
+    """
+    Write failure records to an error log, one JSON object per line.
+
+    Args:
+        error_log (str): Path to the error log file.
+        failures (list): List of dicts with file, stage and error keys.
+    """
+    with open(error_log, "w") as f:
+        for failure in failures:
+            f.write(json.dumps(failure) + "\n")
+
+
+def read_error_log(error_log):
+    """
+    Read the failed file paths from an error log.
+
+    Args:
+        error_log (str): Path to the error log file.
+
+    Returns:
+        list: Paths of the files that failed in a previous run.
+    """
+    if not os.path.exists(error_log):
+        return []
+    with open(error_log) as f:
+        return [json.loads(line)["file"] for line in f if line.strip()]
+
+
+def run_batch(file_paths, factory, factory_args, method_name, workers=None, timeout=None,
+              max_tasks_per_worker=None, init_timeout=WORKER_INIT_TIMEOUT, resource_config=None,
+              desc=None, stats=None):
+    """
+    Run a classifier over a list of files in isolated worker processes.
+
+    A file that exceeds the timeout gets its worker killed and replaced, so a
+    hung decoder or TensorFlow session only costs that one file. Workers are
+    also replaced after max_tasks_per_worker files to bound memory growth.
+    Workers start in the background; one that fails to load its models or
+    misses init_timeout is replaced, and after MAX_INIT_FAILURES failures in
+    a row with no worker left the remaining files are logged as failed.
+
+    Args:
+        file_paths (list): Paths of the audio files to process.
+        factory (callable): Picklable class (or function) that builds the classifier.
+        factory_args (tuple): Positional arguments passed to the factory.
+        method_name (str): Name of the per-file prediction method.
+        workers (int): Number of worker processes. Defaults to the saved
+            resource configuration.
+        timeout (float): Per-file timeout in seconds, or None to wait forever.
+        max_tasks_per_worker (int): Recycle a worker after this many files.
+        init_timeout (float): Seconds a worker may take to load its models,
+            or None to wait forever.
+        resource_config (dict): Thread and core budget applied to each worker.
+            Defaults to the saved configuration, with the cores split across
+            the requested number of workers.
+        desc (str): Progress bar description.
+        stats (dict): If given, no work is handed out until the initial pool
+            of workers is ready, and the seconds taken from then on are stored
+            under "elapsed", so benchmarks can leave out model loading.
+
+    Returns:
+        tuple: (results, failures) where results is a list of prediction dicts
+            and failures a list of dicts with file, stage and error keys.
+    """
+    # TensorFlow sessions are not fork-safe, so always start clean interpreters
+    ctx = multiprocessing.get_context("spawn")
+    if resource_config is None:
+        resource_config = load_resource_config()
+        if workers is not None and workers != resource_config["workers"]:
+            resource_config = default_resource_config(workers)
+    workers = workers or resource_config["workers"]
+    pending = deque(file_paths)
+    results = []
+    failures = []
+    init_failures = 0
+    last_init_error = None
+    # Benchmarks hold work back until the whole initial pool is ready
+    started = None if stats is not None else time.monotonic()
+
+    def record_failure(file_path, stage, error):
+        failures.append({
+            "file": file_path,
+            "stage": stage,
+            "error": error,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        })
+
+    pool = []
+    progress = tqdm(total=len(pending), desc=desc)
+    try:
+        while pending or any(w.current is not None for w in pool):
+            # Start workers for files that no idle or starting worker will pick up
+            while (init_failures < MAX_INIT_FAILURES and len(pool) < workers
+                   and len(pending) > sum(1 for w in pool if w.current is None)):
+                # Replacement workers take over the lowest free slot and its cores
+                slot = min(set(range(workers)) - {w.slot for w in pool})
+                pool.append(_Worker(ctx, slot, resource_config, factory, factory_args,
+                                    method_name, init_timeout))
+
+            if not pool:
+                # Workers keep failing to start, so give up on the rest of the batch
+                while pending:
+                    record_failure(pending.popleft(), "init", last_init_error)
+                    progress.update(1)
+                break
+
+            if started is None and all(w.ready for w in pool):
+                started = time.monotonic()
+            for worker in pool:
+                if started is not None and worker.ready and worker.current is None and pending:
+                    worker.submit(pending.popleft(), timeout)
+
+            watched = [w for w in pool if not w.ready or w.current is not None]
+            deadlines = [w.deadline for w in watched if w.deadline is not None]
+            wait_for = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = wait([w.conn for w in watched], timeout=wait_for)
+
+            for worker in watched:
+                if not worker.ready:
+                    if worker.conn in ready:
+                        try:
+                            status, error = worker.conn.recv()
+                        except EOFError:
+                            worker.process.join(timeout=5)
+                            status, error = "init_failed", f"worker exited with code {worker.process.exitcode}"
+                        if status == "ready":
+                            worker.ready = True
+                            worker.deadline = None
+                            init_failures = 0
+                            continue
+                    elif worker.deadline is not None and time.monotonic() >= worker.deadline:
+                        error = f"not ready after {init_timeout}s"
+                    else:
+                        continue
+                    worker.kill()
+                    pool.remove(worker)
+                    init_failures += 1
+                    last_init_error = error
+                    continue
+
+                if worker.conn in ready:
+                    try:
+                        file_path, prediction, error = worker.conn.recv()
+                    except EOFError:
+                        worker.process.join(timeout=5)
+                        record_failure(worker.current, "crash",
+                                       f"worker exited with code {worker.process.exitcode}")
+                        worker.kill()
+                        pool.remove(worker)
+                    else:
+                        if prediction is not None:
+                            results.append(prediction)
+                        else:
+                            record_failure(file_path, error["stage"], error["error"])
+                        worker.current = None
+                        worker.tasks_done += 1
+                        if max_tasks_per_worker and worker.tasks_done >= max_tasks_per_worker:
+                            worker.stop()
+                            pool.remove(worker)
+                elif worker.deadline is not None and time.monotonic() >= worker.deadline:
+                    record_failure(worker.current, "timeout", f"exceeded {timeout}s")
+                    worker.kill()
+                    pool.remove(worker)
+                else:
+                    continue
+                progress.update(1)
+        if stats is not None:
+            stats["elapsed"] = time.monotonic() - started if started is not None else None
+    finally:
+        progress.close()
+        for worker in pool:
+            if worker.ready and worker.current is None:
+                worker.stop()
+            else:
+                worker.kill()
+
+    return results, failures